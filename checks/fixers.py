@@ -1,22 +1,48 @@
 from __future__ import annotations
+import json
+import numpy as np
 import pandas as pd
+from pathlib import Path
+from collections.abc import Sequence
 from typing import Dict, Any, List, Optional, Any
+from .kernels import clip_and_count
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class FixReport:
+    _FIELDS = ("rule", "table", "column", "action", "affected", "notes")
+
     def __init__(self) -> None:
-        self.actions: List[Dict[str, Any]] = []
+        # one list per field; action dicts are only built when the report is emitted
+        self._rule: list[str] = []
+        self._table: list[str] = []
+        self._column: list[str|None] = []
+        self._action: list[str] = []
+        self._affected: list[int] = []
+        self._notes: list[str] = []
         self.total_rows_before: Optional[int] = None
         self.total_rows_after: Optional[int] = None
 
     def add(self, *, rule: str, table: str, column: str|None, action: str, affected: int, notes: str = "") -> None:
-        self.actions.append({
-            "rule": rule,
-            "table": table,
-            "column": column,
-            "action": action,
-            "affected": int(affected),
-            "notes": notes,
-        })
+        self._rule.append(rule)
+        self._table.append(table)
+        self._column.append(column)
+        self._action.append(action)
+        self._affected.append(int(affected))
+        self._notes.append(notes)
+
+    @property
+    def actions(self) -> List[Dict[str, Any]]:
+        cols = (self._rule, self._table, self._column, self._action, self._affected, self._notes)
+        return [dict(zip(self._FIELDS, row)) for row in zip(*cols)]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -25,78 +51,176 @@ class FixReport:
             "actions": self.actions,
         }
 
-def trim_strings(df: pd.DataFrame, columns: List[str], report: FixReport, table_name: str) -> pd.DataFrame:
+class FixContext:
+    """State shared between the check pass and ``apply_fixes`` within one run."""
+
+    def __init__(self) -> None:
+        # (column, parse_format) -> dates parsed by the freshness check, indexed like the checked frame
+        self.parsed_cache: dict[tuple[str, str|None], pd.Series] = {}
+        # tuple(subset) or None (all columns) -> duplicate mask from the check pass, aligned with the frame's rows
+        self.dup_masks: dict[tuple[str, ...]|None, np.ndarray] = {}
+
+    def invalidate(self, column: str) -> None:
+        for key in [k for k in self.parsed_cache if k[0] == column]:
+            del self.parsed_cache[key]
+        for subset in [k for k in self.dup_masks if k is None or column in k]:
+            del self.dup_masks[subset]
+
+def write_csv(df: pd.DataFrame, dest, *, header: bool = True, engine: str = "pandas") -> None:
+    """Write ``df`` without its index to a path or binary file object.
+
+    ``engine="pyarrow"`` uses the multithreaded Arrow writer (strings quoted, timestamps in full ISO form);
+    frames Arrow cannot type, such as mixed object columns, are written by pandas.
+    """
+    if engine == "pyarrow" and pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = None
+        if table is not None:
+            pacsv.write_csv(table, str(dest) if isinstance(dest, Path) else dest, pacsv.WriteOptions(include_header=header))
+            return
+    df.to_csv(dest, index=False, header=header)
+
+def write_json(obj: Any, path) -> None:
+    """Write ``obj`` as 2-space indented JSON; uses orjson (which also accepts numpy scalars) when installed."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        Path(path).write_text(json.dumps(obj, indent=2), encoding="utf-8")
+
+def _strip(values: np.ndarray) -> tuple[np.ndarray, int]:
+    """Trim whitespace from an object array; returns the trimmed strings and how many changed.
+
+    Missing values come back as strings too ("nan", "None"), as with ``astype(str)``.
+    """
+    if pa is not None:
+        try:
+            arr = pa.array(values, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None  # mixed non-string objects: use the NumPy path
+        if arr is not None:
+            trimmed = pc.utf8_trim_whitespace(arr)
+            changed = pc.not_equal(pc.binary_length(arr), pc.binary_length(trimmed))
+            idx = np.flatnonzero(pc.fill_null(changed, False).to_numpy(zero_copy_only=False))
+            nulls = np.flatnonzero(arr.is_null().to_numpy(zero_copy_only=False))
+            # only changed and missing values get new string objects; the rest are shared with ``values``
+            out = values.copy()
+            out[idx] = trimmed.take(pa.array(idx)).to_numpy(zero_copy_only=False)
+            out[nulls] = values[nulls].astype(str)
+            return out, len(idx)
+    before = values.astype("U")
+    after = np.char.strip(before)
+    return after, int(np.count_nonzero(before != after))
+
+def trim_strings(df: pd.DataFrame, columns: List[str], report: FixReport, table_name: str, ctx: FixContext|None = None) -> pd.DataFrame:
     affected = 0
     for col in columns:
         if col in df.columns and pd.api.types.is_object_dtype(df[col]):
-            before = df[col].astype(str)
-            after = before.str.strip()
-            changed = (before != after)
-            affected += int(changed.sum())
+            after, changed = _strip(df[col].to_numpy())
+            affected += changed
             df[col] = after
+            if changed and ctx is not None:
+                ctx.invalidate(col)
     if affected:
         report.add(rule=f"{table_name}_trim", table=table_name, column=None, action="trim_strings", affected=affected)
     return df
 
-def drop_exact_duplicates(df: pd.DataFrame, subset: List[str]|None, report: FixReport, table_name: str, quarantine_dir) -> pd.DataFrame:
+def drop_exact_duplicates(df: pd.DataFrame, subset: List[str]|None, report: FixReport, table_name: str, quarantine_dir,
+                          csv_engine: str = "pandas", dup_mask: np.ndarray|None = None) -> pd.DataFrame:
     subset = subset or df.columns.tolist()
-    dup_mask = df.duplicated(subset=subset, keep="first")
-    affected = int(dup_mask.sum())
+    if dup_mask is None:
+        dup_mask = df.duplicated(subset=subset, keep="first").to_numpy()
+    dup_idx = np.flatnonzero(dup_mask)
+    affected = len(dup_idx)
     if affected:
         qpath = quarantine_dir / f"{table_name}_duplicate_rows.csv"
-        df.loc[dup_mask].to_csv(qpath, index=False)
+        write_csv(df.take(dup_idx), qpath, engine=csv_engine)
         report.add(rule=f"{table_name}_duplicate", table=table_name, column=None, action="drop_duplicates", affected=affected, notes=f"subset={subset}")
-        df = df.loc[~dup_mask].copy()
+        df = df.take(np.flatnonzero(~dup_mask))
     return df
 
 def clip_range(df: pd.DataFrame, column: str, min_val: float|None, max_val: float|None, report: FixReport, table_name: str, quarantine_dir) -> pd.DataFrame:
-    if column not in df.columns:
-        return df
-    series = pd.to_numeric(df[column], errors="coerce")
-    before = series.copy()
-    clipped = series.clip(lower=min_val, upper=max_val)
-    changed_mask = (before != clipped) & before.notna()
-    affected = int(changed_mask.sum())
-    if affected:
-        qpath = quarantine_dir / f"{table_name}_{column}_range_clipped.csv"
-        import pandas as _pd
-        _pd.DataFrame({column: before[changed_mask], f"{column}_clipped": clipped[changed_mask]}).to_csv(qpath, index=False)
-        report.add(rule=f"{table_name}_{column}_range", table=table_name, column=column, action="clip", affected=affected, notes=f"min={min_val}, max={max_val}")
-        df[column] = clipped
-    return df
+    return apply_fixes(df, [(column, [("clip", (min_val, max_val))])], report, table_name, quarantine_dir)
 
 def enforce_enum(df: pd.DataFrame, column: str, allowed: List[Any], report: FixReport, table_name: str, quarantine_dir) -> pd.DataFrame:
-    if column not in df.columns:
-        return df
-    mask_invalid = ~df[column].isin(allowed)
-    affected = int(mask_invalid.sum())
-    if affected:
-        qpath = quarantine_dir / f"{table_name}_{column}_enum_invalid.csv"
-        df.loc[mask_invalid, [column]].to_csv(qpath, index=False)
-        report.add(rule=f"{table_name}_{column}_enum", table=table_name, column=column, action="quarantine_invalid_enum", affected=affected, notes=f"allowed={allowed}")
-    return df
+    return apply_fixes(df, [(column, [("enum", allowed)])], report, table_name, quarantine_dir)
 
 def fill_nulls(df: pd.DataFrame, column: str, fill_value: Any, report: FixReport, table_name: str) -> pd.DataFrame:
-    if column not in df.columns:
-        return df
-    mask = df[column].isna()
-    affected = int(mask.sum())
-    if affected:
-        df.loc[mask, column] = fill_value
-        report.add(rule=f"{table_name}_{column}_null_fill", table=table_name, column=column, action="fillna", affected=affected, notes=f"value={fill_value!r}")
-    return df
+    return apply_fixes(df, [(column, [("fill", fill_value)])], report, table_name, None)
 
 def parse_dates(df: pd.DataFrame, column: str, fmt: str|None, report: FixReport, table_name: str, quarantine_dir) -> pd.DataFrame:
-    if column not in df.columns:
-        return df
-    parsed = pd.to_datetime(df[column], format=fmt, errors="coerce")
-    mask_bad = parsed.isna() & df[column].notna()
-    affected_bad = int(mask_bad.sum())
-    if affected_bad:
-        qpath = quarantine_dir / f"{table_name}_{column}_unparsed_dates.csv"
-        df.loc[mask_bad, [column]].to_csv(qpath, index=False)
-        report.add(rule=f"{table_name}_{column}_date_parse", table=table_name, column=column, action="quarantine_unparsed_dates", affected=affected_bad, notes=f"format={fmt or 'auto'}")
-    mask_ok = parsed.notna()
-    if int(mask_ok.sum()) > 0:
-        df.loc[mask_ok, column] = parsed[mask_ok]
+    return apply_fixes(df, [(column, [("date_fmt", fmt)])], report, table_name, quarantine_dir)
+
+def apply_fixes(df: pd.DataFrame, plan: list[tuple[str, list[tuple[str, Any]]]], report: FixReport, table_name: str, quarantine_dir,
+                trim_columns: Sequence[str] = (), duplicate_subsets: Sequence[list[str]|None] = (), csv_engine: str = "pandas",
+                ctx: FixContext|None = None) -> pd.DataFrame:
+    """Apply a compiled fix plan, reading and writing each planned column once per step.
+
+    ``plan`` is a list of ``(column, actions)`` steps, one per column entry of the rules, whose actions
+    ``("clip", (lo, hi))``, ``("enum", allowed)``, ``("fill", value)`` and ``("date_fmt", fmt)`` run in rule
+    order, each seeing the previous one's result. ``trim_columns`` are trimmed first so duplicate keys compare
+    on trimmed values, then duplicates are dropped and the steps run. Quarantine files are written with
+    ``write_csv`` using ``csv_engine``. Dates already parsed into ``ctx.parsed_cache`` and duplicate masks in
+    ``ctx.dup_masks`` are reused (once) while their columns and rows are still unmodified.
+    """
+    df = trim_strings(df, list(trim_columns), report, table_name, ctx)
+    for subset in duplicate_subsets:
+        dup_mask = ctx.dup_masks.pop(tuple(subset) if subset else None, None) if ctx is not None else None
+        if dup_mask is not None and len(dup_mask) != len(df):
+            dup_mask = None  # an earlier subset already dropped rows
+        df = drop_exact_duplicates(df, subset=subset, report=report, table_name=table_name, quarantine_dir=quarantine_dir,
+                                   csv_engine=csv_engine, dup_mask=dup_mask)
+    for col, actions in plan:
+        if col not in df.columns or not actions:
+            continue
+        series = df[col]; dirty = False
+        for action, arg in actions:
+            if action == "clip" and arg != (None, None):
+                min_val, max_val = arg
+                before = pd.to_numeric(series, errors="coerce").to_numpy()
+                clipped, changed, affected = clip_and_count(before, min_val, max_val)
+                if affected:
+                    qpath = quarantine_dir / f"{table_name}_{col}_range_clipped.csv"
+                    write_csv(pd.DataFrame({col: before[changed], f"{col}_clipped": clipped[changed]}), qpath, engine=csv_engine)
+                    report.add(rule=f"{table_name}_{col}_range", table=table_name, column=col, action="clip", affected=affected, notes=f"min={min_val}, max={max_val}")
+                    series = pd.Series(clipped, index=series.index, name=col); dirty = True
+            elif action == "enum":
+                allowed = arg
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    allowed_codes = series.cat.categories.get_indexer(allowed)
+                    mask_invalid = ~np.isin(series.cat.codes.to_numpy(), allowed_codes[allowed_codes >= 0])
+                else:
+                    mask_invalid = ~series.isin(allowed).to_numpy()
+                affected = int(np.count_nonzero(mask_invalid))
+                if affected:
+                    qpath = quarantine_dir / f"{table_name}_{col}_enum_invalid.csv"
+                    write_csv(series[mask_invalid].to_frame(), qpath, engine=csv_engine)
+                    report.add(rule=f"{table_name}_{col}_enum", table=table_name, column=col, action="quarantine_invalid_enum", affected=affected, notes=f"allowed={allowed}")
+            elif action == "fill":
+                mask = series.isna().to_numpy()
+                affected = int(np.count_nonzero(mask))
+                if affected:
+                    series = series.copy(); series[mask] = arg; dirty = True
+                    report.add(rule=f"{table_name}_{col}_null_fill", table=table_name, column=col, action="fillna", affected=affected, notes=f"value={arg!r}")
+            elif action == "date_fmt":
+                fmt = arg
+                cached = ctx.parsed_cache.pop((col, fmt), None) if ctx is not None else None
+                if cached is not None and not dirty:
+                    parsed = cached.reindex(series.index)
+                else:
+                    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+                mask_bad = (parsed.isna() & series.notna()).to_numpy()
+                affected_bad = int(np.count_nonzero(mask_bad))
+                if affected_bad:
+                    qpath = quarantine_dir / f"{table_name}_{col}_unparsed_dates.csv"
+                    write_csv(series[mask_bad].to_frame(), qpath, engine=csv_engine)
+                    report.add(rule=f"{table_name}_{col}_date_parse", table=table_name, column=col, action="quarantine_unparsed_dates", affected=affected_bad, notes=f"format={fmt or 'auto'}")
+                mask_ok = parsed.notna().to_numpy()
+                if mask_ok.any():
+                    series = series.copy(); series[mask_ok] = parsed[mask_ok]; dirty = True
+        if dirty:
+            df[col] = series
+            if ctx is not None:
+                ctx.invalidate(col)
     return df
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+NAT_NS = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+def clip_and_count(a: np.ndarray, lo, hi) -> tuple[np.ndarray, np.ndarray, int]:
+    """Clip ``a`` to [lo, hi] (None = unbounded); returns (clipped, changed mask, changed count).
+
+    Missing values pass through and are never counted; the result dtype follows ``np.clip``.
+    """
+    clipped = np.clip(a, lo, hi)
+    changed = a != clipped
+    if a.dtype.kind == "f":
+        changed &= ~np.isnan(a)
+    return clipped, changed, int(np.count_nonzero(changed))
+
+def range_mask(a: np.ndarray, lo, hi) -> np.ndarray:
+    """Flag values below ``lo`` or above ``hi`` (None = unbounded); NaN is never flagged."""
+    mask = a < lo if lo is not None else np.zeros(a.shape[0], dtype=bool)
+    if hi is not None:
+        mask |= a > hi
+    return mask
+
+def row_hashes(keys: pd.DataFrame, as_float=()) -> np.ndarray:
+    """Hash each row of ``keys`` to a uint64 from its exact values (missing values hash alike).
+
+    Integer columns are hashed as integers, so distinct keys above 2**53 stay distinct. Float columns, and
+    the columns named in ``as_float`` (read as int in one chunk and float in another), are hashed as
+    float64 with -0.0 folded into 0.0.
+    """
+    floats = {c for c in keys.columns if keys[c].dtype.kind == "f"} | set(as_float)
+    if floats:
+        keys = keys.assign(**{c: keys[c].to_numpy(np.float64, na_value=np.nan) + 0.0 for c in floats})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def freshness_mask(parsed: np.ndarray, notna: np.ndarray, now: int, min_age) -> np.ndarray:
+    """Flag values that failed to parse or are at least ``min_age`` ns old (None = no age limit).
+
+    ``parsed`` holds int64 nanoseconds with NaT as ``NAT_NS``; ``notna`` marks non-missing source values.
+    The age test compares against one cutoff timestamp, so no int64 age array is built.
+    """
+    nat = parsed == NAT_NS
+    cutoff = None if min_age is None else int(now) - min_age
+    if cutoff is None or cutoff <= NAT_NS:  # no limit, or a cutoff before any representable date
+        return np.logical_and(nat, notna, out=nat)
+    mask = parsed <= min(cutoff, INT64_MAX)
+    np.copyto(mask, notna, where=nat)
+    return mask
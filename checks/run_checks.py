@@ -1,14 +1,359 @@
 from __future__ import annotations
-import argparse, json
+import argparse, math
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache, partial
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import yaml
+from pandas.tseries.api import guess_datetime_format
 try:
-    from .fixers import (FixReport, trim_strings, drop_exact_duplicates, clip_range, enforce_enum, fill_nulls, parse_dates)
-except Exception:
-    from fixers import (FixReport, trim_strings, drop_exact_duplicates, clip_range, enforce_enum, fill_nulls, parse_dates)
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+from .fixers import FixContext, FixReport, apply_fixes, write_csv, write_json
+from .kernels import freshness_mask, range_mask, row_hashes
 
-def main():
+CHUNK_ROWS = 200_000
+SAMPLE_ROWS = 200
+CATEGORY_MAX_RATIO = 0.5
+DAY_NS = 86_400_000_000_000
+# pandas' default NA strings for read_csv, handed to the Arrow reader so both engines agree
+NA_STRINGS = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+              "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+_NOT_DATES = {"", "NaT", "nat", "NAT", "nan", "NaN", "NAN", "now", "today"}  # values pandas skips when guessing
+
+# helpers
+def _read_chunks(src, delimiter, encoding, chunksize, engine="pandas"):
+    """Yield ``src`` as DataFrame chunks of at most ``chunksize`` rows (always at least one chunk).
+
+    The pandas reader streams the file. With pyarrow (``engine="pyarrow"``, or ``"auto"`` when installed)
+    the whole file is parsed by the multithreaded Arrow reader into one typed table, so column types are
+    inferred over the whole file but peak memory is higher; only one batch at a time is converted to
+    pandas. Arrow treats the same strings as missing as pandas does.
+    """
+    if engine == "pandas" or (engine == "auto" and pacsv is None):
+        with pd.read_csv(src, delimiter=delimiter, encoding=encoding, chunksize=chunksize) as reader:
+            yield from reader
+        return
+    if pacsv is None:
+        raise SystemExit("--engine pyarrow requires the pyarrow package")
+    table = pacsv.read_csv(src, read_options=pacsv.ReadOptions(block_size=16 << 20, encoding=encoding),
+                           parse_options=pacsv.ParseOptions(delimiter=delimiter),
+                           convert_options=pacsv.ConvertOptions(null_values=NA_STRINGS, strings_can_be_null=True))
+    if table.num_rows == 0:
+        yield table.to_pandas()
+        return
+    offset = 0
+    for batch in table.to_batches(max_chunksize=chunksize):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk)); offset += len(chunk)
+        yield chunk
+
+def _category_columns(specs, columns):
+    """The columns compared by enum and duplicate checks, the only ones worth storing as ``category``."""
+    cols = []
+    for s in specs:
+        if s["type"] == "enum":
+            cols.append(s["column"])
+        elif s["type"] == "duplicate":
+            cols.extend(s["params"]["subset"] or columns)
+    return [c for c in dict.fromkeys(cols) if c in columns]
+
+def _categorize(chunk, columns):
+    """Return a shallow copy with the low-cardinality string columns among ``columns`` stored as ``category``."""
+    out = chunk.copy(deep=False)
+    for c in columns:
+        if pd.api.types.is_object_dtype(chunk[c]):
+            codes, uniques = pd.factorize(chunk[c])
+            if len(uniques) < CATEGORY_MAX_RATIO * len(chunk):
+                out[c] = pd.Categorical.from_codes(codes, uniques)
+    return out
+
+def _typed_column(series, numeric):
+    """Coerce one column: ``(numeric_arr, isna_mask, values)``; ``numeric_arr`` only when ``numeric``."""
+    num = None
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.array
+        if numeric:
+            # coerce the categories only; code -1 (missing) picks the trailing NaN
+            cats = pd.to_numeric(series.cat.categories, errors="coerce").to_numpy(dtype="f8", na_value=np.nan)
+            num = np.append(cats, np.nan)[values.codes]
+    else:
+        values = series.to_numpy()
+        if numeric:
+            num = pd.to_numeric(series, errors="coerce").to_numpy(dtype="f8", na_value=np.nan)
+    return num, series.isna().to_numpy(), values
+
+def _typed_columns(chunk, specs, pool=None):
+    """Coerce every referenced column once per chunk: ``col -> (numeric_arr, isna_mask, values)``."""
+    numeric = {s["column"] for s in specs if s["type"] == "range"}
+    cols = list(dict.fromkeys(s["column"] for s in specs if s["column"] is not None))
+    run = pool.map if pool is not None else map
+    return dict(zip(cols, run(lambda c: _typed_column(chunk[c], c in numeric), cols)))
+
+def _mask_range(num, min_v, max_v):
+    return range_mask(num, min_v, max_v)
+
+def _mask_enum(values, allowed):
+    if isinstance(values, pd.Categorical):
+        allowed_codes = values.categories.get_indexer(allowed)
+        return ~np.isin(values.codes, allowed_codes[allowed_codes >= 0])
+    return ~pd.Series(values, copy=False).isin(allowed).to_numpy()  # hash lookup; np.isin compares pairwise
+
+def _rows_equal(a, b):
+    """Row-wise equality of two equally long key frames, with missing equal to missing."""
+    eq = np.ones(len(a), dtype=bool)
+    for c in a.columns:
+        x = a[c].to_numpy(); y = b[c].to_numpy()
+        eq &= (x == y) | (pd.isna(x) & pd.isna(y))
+    return eq
+
+class _SeenKeys:
+    """Duplicate-subset keys of earlier chunks, for flagging repeats across chunks.
+
+    The first occurrence of every key is kept, one frame per chunk, and indexed by a uint64 hash of its
+    exact values in an open-addressing table that grows by doubling, so each chunk costs time in its own
+    size only. A lookup only counts once the stored key compares equal, and probes on past keys that
+    merely share the hash, so collisions never flag a row or hide one. A column that one chunk read as
+    int and a later one as float is hashed as float64 from then on, as a whole-file read would type it.
+    """
+
+    def __init__(self):
+        self.parts = []  # first occurrences, one key frame per chunk
+        self.starts = []  # number of the first stored key of each part
+        self.hashes = np.empty(1 << 10, dtype=np.uint64)  # hash of stored key i, buffer grown by doubling
+        self.n = 0
+        self.slots = np.full(1 << 11, -1, dtype=np.int64)  # stored key numbers by hash slot, -1 = empty
+        self.as_float = set()
+
+    def _place(self, rows):
+        """Insert stored keys ``rows`` into the slot table by linear probing."""
+        wrap = len(self.slots) - 1
+        pos = (self.hashes[rows] & wrap).astype(np.int64)
+        while rows.size:
+            free = np.flatnonzero(self.slots[pos] < 0)
+            self.slots[pos[free]] = rows[free]  # rows racing for one slot: the last write wins
+            left = np.ones(len(rows), dtype=bool)
+            left[free] = self.slots[pos[free]] != rows[free]
+            rows = rows[left]; pos = (pos[left] + 1) & wrap
+
+    def _equal(self, keys, rows):
+        """Whether each row of ``keys`` equals the stored key of the same position in ``rows``."""
+        eq = np.empty(len(rows), dtype=bool)
+        part = np.searchsorted(self.starts, rows, side="right") - 1
+        for i in np.unique(part):
+            sel = np.flatnonzero(part == i)
+            eq[sel] = _rows_equal(keys.take(sel), self.parts[i].take(rows[sel] - self.starts[i]))
+        return eq
+
+    def _find(self, keys, h):
+        """Whether each row of ``keys`` (with hashes ``h``) is already stored."""
+        found = np.zeros(len(h), dtype=bool)
+        wrap = len(self.slots) - 1
+        pos = (h & wrap).astype(np.int64)
+        todo = np.arange(len(h))
+        while todo.size:
+            rows = self.slots[pos[todo]]
+            live = rows >= 0  # an empty slot ends the probe: not stored
+            todo = todo[live]; rows = rows[live]
+            same = np.flatnonzero(self.hashes[rows] == h[todo])
+            if same.size:
+                hit = np.zeros(len(todo), dtype=bool)
+                hit[same] = self._equal(keys.take(todo[same]), rows[same])
+                found[todo[hit]] = True
+                todo = todo[~hit]
+            pos[todo] = (pos[todo] + 1) & wrap
+        return found
+
+    def _store(self, keys, h):
+        n = self.n + len(h)
+        if n > len(self.hashes):
+            grown = np.empty(max(n, 2 * len(self.hashes)), dtype=np.uint64)
+            grown[:self.n] = self.hashes[:self.n]; self.hashes = grown
+        self.hashes[self.n:n] = h
+        self.parts.append(keys); self.starts.append(self.n)
+        rows = np.arange(self.n, n); self.n = n
+        if 2 * n > len(self.slots):
+            size = len(self.slots)
+            while 2 * n > size:
+                size *= 2
+            self.slots = np.full(size, -1, dtype=np.int64)
+            rows = np.arange(n)
+        self._place(rows)
+
+    def flag(self, keys):
+        """Flag rows of ``keys`` that repeat an earlier row of this or a previous call; remember the rest."""
+        mask = keys.duplicated(keep="first").to_numpy()
+        firsts = keys.take(np.flatnonzero(~mask))
+        if self.parts:
+            ref = self.parts[0]
+            widened = {c for c in keys.columns if c not in self.as_float and keys[c].dtype != ref[c].dtype
+                       and keys[c].dtype.kind in "iuf" and ref[c].dtype.kind in "iuf"}
+            if widened:
+                self.as_float |= widened
+                self.hashes[:self.n] = np.concatenate([row_hashes(p, self.as_float) for p in self.parts])
+                self.slots.fill(-1)
+                self._place(np.arange(self.n))
+        h = row_hashes(firsts, self.as_float)
+        found = self._find(firsts, h) if self.n else np.zeros(len(h), dtype=bool)
+        mask[np.flatnonzero(~mask)[found]] = True
+        new = np.flatnonzero(~found)
+        self._store(firsts.take(new), h[new])
+        return mask
+
+def _mask_duplicate(df, subset, seen=None):
+    """Flag repeated rows; ``seen`` (a ``_SeenKeys``) carries keys from earlier chunks across calls."""
+    subset = subset or df.columns.tolist()
+    if seen is None:
+        return df.duplicated(subset=subset, keep="first").to_numpy()
+    return seen.flag(df[subset])
+
+def _infer_date_format(series):
+    """The format ``pd.to_datetime`` would infer for ``series``; None while it holds no usable value.
+
+    pandas guesses from the first non-null string and parses element by element ("mixed") when that
+    guess fails or the first value is not a string.
+    """
+    for v in series.dropna():
+        if isinstance(v, str) and v in _NOT_DATES:
+            continue
+        return (guess_datetime_format(v) if type(v) is str else None) or "mixed"
+    return None
+
+def _mask_freshness(series, max_age_days=None, parse_format=None, parsed=None):
+    if parsed is None:
+        parsed = pd.to_datetime(series, format=parse_format, errors="coerce")
+    parsed = parsed.to_numpy("datetime64[ns]").view("i8")
+    # age in whole days exceeds max_age_days <=> at least floor(max_age_days) + 1 full days old
+    min_age = None if max_age_days is None else (math.floor(max_age_days) + 1) * DAY_NS
+    now = np.datetime64("now", "ns").astype(np.int64)
+    return freshness_mask(parsed, series.notna().to_numpy(), now, min_age)
+
+# check kernels: rule parameters are bound with functools.partial, leaving (chunk, typed)
+def _run_check(chunk, typed, spec):
+    return spec["mask_fn"](chunk, typed)
+
+def _check_duplicate(subset, seen, sink, chunk, typed):
+    mask = _mask_duplicate(chunk, subset, seen)
+    if sink is not None:
+        sink.append(mask)
+    return mask
+
+def _check_range(cname, min_v, max_v, chunk, typed):
+    return _mask_range(typed[cname][0], min_v, max_v)
+
+def _check_enum(cname, allowed, chunk, typed):
+    return _mask_enum(typed[cname][2], allowed)
+
+def _check_null_rate(cname, chunk, typed):
+    return typed[cname][1]
+
+def _check_freshness(cname, max_age_days, parse_format, sink, inferred, chunk, typed):
+    if parse_format is None:
+        # infer once, like a whole-file read would, instead of from each chunk's first value
+        if not inferred and (fmt := _infer_date_format(chunk[cname])) is not None:
+            inferred.append(fmt)
+        parse_format = inferred[0] if inferred else None
+    parsed = pd.to_datetime(chunk[cname], format=parse_format, errors="coerce")
+    if sink is not None:
+        sink.append(parsed)
+    return _mask_freshness(chunk[cname], max_age_days, parse_format, parsed)
+
+@lru_cache(maxsize=8)
+def _parse_rules(text):
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def _compile_checks(rules, date_sinks=None, dup_sinks=None):
+    """Flatten the YAML rules into check specs with bound mask functions and per-run accumulators.
+
+    When ``date_sinks`` is a dict, freshness checks with an explicit ``parse_format`` append each chunk's
+    parsed dates to ``date_sinks[(column, parse_format)]`` for reuse by the fix pass. Auto-detected formats
+    are not shared: the fix pass infers its own from the trimmed frame.
+    Likewise ``dup_sinks[tuple(subset) or None]`` collects each chunk's duplicate mask.
+    """
+    specs = []; stems = {}
+    def _add(name, tname, cname, ctype, params, mask_fn):
+        # checks that can never fail collect no failure samples
+        never_fails = (ctype == "freshness" and params["max_age_days"] is None) or \
+                      (ctype == "null_rate" and params["max_nulls"] is None and params["max_null_frac"] is None)
+        # names repeat when a column or table has several checks of one type; each gets its own sample file
+        stem = name.replace(".","_"); n = stems[stem] = stems.get(stem, 0) + 1
+        specs.append({"name": name, "table": tname, "column": cname, "type": ctype, "params": params,
+                      "sample": f"{stem}.csv" if n == 1 else f"{stem}_{n}.csv",
+                      "mask_fn": mask_fn, "count": 0, "remaining": 0 if never_fails else SAMPLE_ROWS})
+    for t in rules.get("tables", []):
+        tname = t.get("name","table")
+        for chk in t.get("checks", []):
+            if chk.get("type") == "duplicate":
+                subset = chk.get("subset"); key = tuple(subset) if subset else None; sink = None
+                if dup_sinks is not None and key not in dup_sinks:
+                    sink = dup_sinks[key] = []
+                _add(f"{tname}.duplicate", tname, None, "duplicate", {"subset": subset}, partial(_check_duplicate, subset, _SeenKeys(), sink))
+        for col in t.get("columns", []):
+            cname = col.get("name")
+            for chk in col.get("checks", []):
+                ctype = chk.get("type"); mask_fn = None
+                if ctype == "range":
+                    params = {"min": chk.get("min"), "max": chk.get("max")}
+                    mask_fn = partial(_check_range, cname, params["min"], params["max"])
+                elif ctype == "enum":
+                    params = {"allowed": chk.get("allowed", [])}
+                    mask_fn = partial(_check_enum, cname, params["allowed"])
+                elif ctype == "null_rate":
+                    params = {"max_nulls": chk.get("max_nulls"), "max_null_frac": chk.get("max_null_frac")}
+                    mask_fn = partial(_check_null_rate, cname)
+                elif ctype == "freshness":
+                    params = {"max_age_days": chk.get("max_age_days"), "parse_format": chk.get("parse_format")}
+                    key = (cname, params["parse_format"]); sink = None
+                    if date_sinks is not None and key[1] is not None and key not in date_sinks:
+                        sink = date_sinks[key] = []
+                    mask_fn = partial(_check_freshness, cname, params["max_age_days"], params["parse_format"], sink, [])
+                else:
+                    params = {}
+                _add(f"{tname}.{cname}.{ctype}", tname, cname, ctype, params, mask_fn)
+    return specs
+
+def _status(spec, total_rows):
+    ctype = spec["type"]; p = spec["params"]; count = spec["count"]
+    if ctype in ("duplicate", "range", "enum"):
+        return "fail" if count>0 else "pass"
+    if ctype == "null_rate":
+        ok_by_count = (p["max_nulls"] is None) or (count <= p["max_nulls"])
+        frac = count / max(1, total_rows)
+        ok_by_frac = (p["max_null_frac"] is None) or (frac <= p["max_null_frac"])
+        return "pass" if (ok_by_count and ok_by_frac) else "fail"
+    if ctype == "freshness":
+        return "fail" if p["max_age_days"] is not None and count>0 else "pass"
+    return "pass"
+
+def _fix_plan(table):
+    """Compile one table's rules into ``apply_fixes`` steps plus its duplicate subsets.
+
+    Each column entry becomes one ``(column, actions)`` step with its actions in rule order, so repeated
+    or interleaved checks on a column run as written.
+    """
+    plan = []; subsets = []
+    for chk in table.get("checks", []):
+        if chk.get("type") == "duplicate":
+            subsets.append(chk.get("subset"))
+    for col in table.get("columns", []):
+        actions = []
+        for chk in col.get("checks", []):
+            ctype = chk.get("type")
+            if ctype == "range":
+                actions.append(("clip", (chk.get("min"), chk.get("max"))))
+            elif ctype == "enum" and isinstance(chk.get("allowed"), list):
+                actions.append(("enum", chk.get("allowed")))
+            elif ctype == "null_rate" and "fill_value" in chk:
+                actions.append(("fill", chk.get("fill_value")))
+            elif ctype == "freshness":
+                actions.append(("date_fmt", chk.get("parse_format")))
+        plan.append((col.get("name"), actions))
+    return plan, subsets
+
+def main(argv=None):
     p = argparse.ArgumentParser(description="Run data quality checks (turnkey).")
     p.add_argument("--rules", type=str, required=True)
     p.add_argument("--out", type=str, required=True)
@@ -21,128 +366,90 @@ def main():
     p.add_argument("--fix-dry-run", action="store_true")
     p.add_argument("--max-impact-pct", type=float, default=2.0, help="Abort if row drops exceed this percent")
     p.add_argument("--max-cell-changes-pct", type=float, default=5.0, help="Abort if cell modifications exceed this percent")
-    args = p.parse_args()
+    p.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="Rows read per chunk while evaluating checks")
+    p.add_argument("--engine", choices=["auto","pandas","pyarrow"], default="pandas", help="CSV parser (auto uses pyarrow when installed); pyarrow reads the whole file at once and also writes the output CSVs")
+    p.add_argument("--jobs", type=int, default=1, help="Threads used to evaluate the checks of each chunk")
+    args = p.parse_args(argv)
 
     out_dir = Path(args.out); out_dir.mkdir(parents=True, exist_ok=True)
-    rules = yaml.safe_load(Path(args.rules).read_text(encoding="utf-8"))
+    rules = _parse_rules(Path(args.rules).read_text(encoding="utf-8"))
     default_src = Path(__file__).resolve().parents[1]/"data"/"sample.csv"
     src = args.source_override or str(default_src)
-    df = pd.read_csv(src, delimiter=args.delimiter, encoding=args.encoding)
-
-    # helpers
-    def _mask_range(series, min_v, max_v):
-        s = pd.to_numeric(series, errors="coerce")
-        m = ((s < min_v) if min_v is not None else False) | ((s > max_v) if max_v is not None else False)
-        return m.fillna(False)
-    def _mask_enum(series, allowed):
-        return (~series.isin(allowed)).fillna(True)
-    def _mask_duplicate(df, subset):
-        return df.duplicated(subset=subset or df.columns.tolist(), keep="first")
-    def _mask_freshness(series, max_age_days=None, parse_format=None):
-        parsed = pd.to_datetime(series, format=parse_format, errors="coerce")
-        if max_age_days is None:
-            return (parsed.isna() & series.notna())
-        age = (pd.Timestamp.utcnow().tz_localize(None) - parsed).dt.days
-        return (parsed.isna() & series.notna()) | (age > max_age_days)
+    fixing = args.fix or args.fix_dry_run
+    csv_engine = "pyarrow" if args.engine == "pyarrow" else "pandas"  # Arrow's CSV formatting differs; opt-in only
 
-    # Evaluate
-    checks = []; passed=0; failed=0
-    for t in rules.get("tables", []):
-        tname = t.get("name","table")
-
-        for chk in t.get("checks", []):
-            if chk.get("type") == "duplicate":
-                subset = chk.get("subset")
-                mask = _mask_duplicate(df, subset)
-                cnt = int(mask.sum()); status = "fail" if cnt>0 else "pass"
-                checks.append({"name": f"{tname}.duplicate", "table": tname, "column": None, "type": "duplicate",
-                               "status": status, "count": cnt, "params": {"subset": subset}})
-                failed += (status=="fail"); passed += (status=="pass")
-
-        for col in t.get("columns", []):
-            cname = col.get("name"); 
-            if cname not in df.columns: 
-                continue
-            for chk in col.get("checks", []):
-                ctype = chk.get("type"); params = {}; status="pass"; count=0
-                if ctype == "range":
-                    min_v, max_v = chk.get("min"), chk.get("max"); params={"min":min_v,"max":max_v}
-                    mask = _mask_range(df[cname], min_v, max_v); count=int(mask.sum()); status="fail" if count>0 else "pass"
-                elif ctype == "enum":
-                    allowed = chk.get("allowed", []); params={"allowed":allowed}
-                    mask = _mask_enum(df[cname], allowed); count=int(mask.sum()); status="fail" if count>0 else "pass"
-                elif ctype == "null_rate":
-                    max_nulls = chk.get("max_nulls"); max_null_frac = chk.get("max_null_frac")
-                    params={"max_nulls": max_nulls, "max_null_frac": max_null_frac}
-                    nulls = df[cname].isna(); count=int(nulls.sum())
-                    ok_by_count = (max_nulls is None) or (count <= max_nulls)
-                    frac = count / max(1, len(df))
-                    ok_by_frac = (max_null_frac is None) or (frac <= max_null_frac)
-                    mask = nulls; status = "pass" if (ok_by_count and ok_by_frac) else "fail"
-                elif ctype == "freshness":
-                    max_age_days = chk.get("max_age_days"); parse_format = chk.get("parse_format")
-                    params={"max_age_days": max_age_days, "parse_format": parse_format}
-                    mask = _mask_freshness(df[cname], max_age_days, parse_format); count=int(mask.sum())
-                    status = "fail" if max_age_days is not None and count>0 else "pass"
+    # Evaluate: stream the source chunk by chunk; only the fix pipeline needs the whole frame
+    ctx = FixContext() if fixing else None
+    date_sinks = {} if fixing else None; dup_sinks = {} if fixing else None
+    specs = _compile_checks(rules, date_sinks, dup_sinks)
+    samples_dir = out_dir / "failures"; samples_dir.mkdir(parents=True, exist_ok=True)
+    frames = []; first = None; total_rows = 0; writers = {}
+    with ExitStack() as stack:
+        pool = stack.enter_context(ThreadPoolExecutor(args.jobs)) if args.jobs > 1 else None
+        run = pool.map if pool is not None else map
+        for chunk in _read_chunks(src, args.delimiter, args.encoding, args.chunksize, args.engine):
+            if first is None:
+                first = chunk.head(1000).copy()  # a view would keep the whole first chunk alive
+                specs = [s for s in specs if s["column"] is None or s["column"] in chunk.columns]
+                live = [s for s in specs if s["mask_fn"] is not None]
+                cat_cols = _category_columns(live, chunk.columns.tolist())
+            total_rows += len(chunk)
+            if fixing:
+                frames.append(chunk)
+            chunk = _categorize(chunk, cat_cols)
+            typed = _typed_columns(chunk, live, pool)
+            masks = run(partial(_run_check, chunk, typed), live)
+            for spec, mask in zip(live, masks):
+                spec["count"] += int(mask.sum())
+                if spec["remaining"] <= 0 or not mask.any():
+                    continue
+                rows = chunk.loc[mask].head(spec["remaining"]); spec["remaining"] -= len(rows)
+                fp = writers.get(spec["sample"])
+                if fp is None:
+                    fp = writers[spec["sample"]] = stack.enter_context((samples_dir / spec["sample"]).open("wb"))
+                    write_csv(rows, fp, engine=csv_engine)
                 else:
-                    mask = pd.Series(False, index=df.index)
+                    write_csv(rows, fp, header=False, engine=csv_engine)
+    df = pd.concat(frames) if frames else first
+    del frames, chunk, typed  # df holds its own copy; the chunks would keep the data resident twice
+    for key, parts in (date_sinks or {}).items():
+        if parts and not any(isinstance(p.dtype, pd.DatetimeTZDtype) for p in parts):
+            ctx.parsed_cache[key] = pd.concat(parts)
+        parts.clear()  # the check specs still reference the sink lists
+    for key, parts in (dup_sinks or {}).items():
+        if parts:
+            ctx.dup_masks[key] = np.concatenate(parts)
+        parts.clear()
 
-                checks.append({"name": f"{tname}.{cname}.{ctype}", "table": tname, "column": cname, "type": ctype,
-                               "status": status, "count": count, "params": params})
-                failed += (status=="fail"); passed += (status=="pass")
+    checks = []; passed=0; failed=0
+    for spec in specs:
+        status = _status(spec, total_rows)
+        checks.append({"name": spec["name"], "table": spec["table"], "column": spec["column"], "type": spec["type"],
+                       "status": status, "count": spec["count"], "params": spec["params"]})
+        failed += (status=="fail"); passed += (status=="pass")
 
-    # Per-rule failure samples
-    samples_dir = out_dir / "failures"; samples_dir.mkdir(parents=True, exist_ok=True)
+    # Per-rule failure samples (written while streaming; dropped again for checks that passed)
     failure_samples = {}
-    for c in checks:
-        if c["status"] != "fail": continue
-        ctype = c["type"]; cname = c.get("column"); fname = c["name"].replace(".","_") + ".csv"; fpath = samples_dir / fname
-        mask = None
-        if ctype == "duplicate":
-            subset = c["params"].get("subset"); mask = _mask_duplicate(df, subset)
-        elif ctype == "range" and cname in df.columns:
-            p=c["params"]; mask = _mask_range(df[cname], p.get("min"), p.get("max"))
-        elif ctype == "enum" and cname in df.columns:
-            p=c["params"]; mask = _mask_enum(df[cname], p.get("allowed", []))
-        elif ctype == "null_rate" and cname in df.columns:
-            mask = df[cname].isna()
-        elif ctype == "freshness" and cname in df.columns:
-            p=c["params"]; mask = _mask_freshness(df[cname], p.get("max_age_days"), p.get("parse_format"))
-        if mask is not None:
-            df.loc[mask].head(200).to_csv(fpath, index=False)
-            failure_samples[c["name"]] = fpath.name
+    for spec, c in zip(specs, checks):
+        if spec["sample"] not in writers: continue
+        if c["status"] == "fail":
+            failure_samples[c["name"]] = spec["sample"]
+        else:
+            (samples_dir / spec["sample"]).unlink()
 
     # FIX PIPELINE
     cleaned_path = out_dir / "cleaned.csv"
     fix_report_path = out_dir / "fix_report.json"
     quarantine_dir = out_dir / "quarantine"
-    if args.fix or args.fix_dry_run:
+    if fixing:
         quarantine_dir.mkdir(parents=True, exist_ok=True)
         report = FixReport()
         report.total_rows_before = int(len(df))
 
         for table in rules.get("tables", []):
-            tname = table.get("name", "table")
-            df = trim_strings(df, [c for c in df.columns], report, tname)
-            for chk in table.get("checks", []):
-                if chk.get("type") == "duplicate":
-                    subset = chk.get("subset")
-                    df = drop_exact_duplicates(df, subset=subset, report=report, table_name=tname, quarantine_dir=quarantine_dir)
-            for col in table.get("columns", []):
-                cname = col.get("name")
-                for chk in col.get("checks", []):
-                    ctype = chk.get("type")
-                    if ctype == "range":
-                        df = clip_range(df, column=cname, min_val=chk.get("min"), max_val=chk.get("max"), report=report, table_name=tname, quarantine_dir=quarantine_dir)
-                    elif ctype == "enum":
-                        allowed = chk.get("allowed")
-                        if isinstance(allowed, list):
-                            df = enforce_enum(df, column=cname, allowed=allowed, report=report, table_name=tname, quarantine_dir=quarantine_dir)
-                    elif ctype == "null_rate" and "fill_value" in chk:
-                        df = fill_nulls(df, column=cname, fill_value=chk.get("fill_value"), report=report, table_name=tname)
-                    elif ctype == "freshness":
-                        fmt = chk.get("parse_format")
-                        df = parse_dates(df, column=cname, fmt=fmt, report=report, table_name=tname, quarantine_dir=quarantine_dir)
+            plan, subsets = _fix_plan(table)
+            df = apply_fixes(df, plan, report, table.get("name", "table"), quarantine_dir, trim_columns=df.columns.tolist(),
+                             duplicate_subsets=subsets, csv_engine=csv_engine, ctx=ctx)
 
         report.total_rows_after = int(len(df))
 
@@ -160,26 +467,21 @@ def main():
                 cell_pct = 100.0 * (cell_changes / total_cells)
                 if cell_pct > args.max_cell_changes_pct:
                     raise SystemExit(f"Cell changes {cell_pct:.2f}% exceed --max-cell-changes-pct {args.max_cell_changes_pct:.2f}%")
-            with fix_report_path.open("w", encoding="utf-8") as fp:
-                json.dump(rep, fp, indent=2)
+            write_json(rep, fix_report_path)
 
         if args.fix and not args.fix_dry_run:
-            df.to_csv(cleaned_path, index=False)
+            write_csv(df, cleaned_path, engine=csv_engine)
 
     # Viz data (null heatmap)
     viz = None
     if args.viz == "on":
-        import pandas as _pd
         null_cols = [c["column"] for c in checks if c["type"]=="null_rate" and c["status"]=="fail" and c.get("column")]
         if not null_cols:
             head = df.head(1000)
             fracs = head.isna().mean().sort_values(ascending=False)
             null_cols = [c for c in fracs.index.tolist() if fracs[c] > 0.0]
         null_cols = [c for c in null_cols if c in df.columns][:14]
-        sample = df.head(10).copy()
-        grid = []
-        for _, row in sample.iterrows():
-            grid.append([1 if _pd.isna(row[c]) else 0 for c in null_cols])
+        grid = df.head(10)[null_cols].isna().astype(np.int8).to_numpy().tolist()
         viz = {"null_heatmap": {"cols": null_cols, "grid": grid}}
 
     evaluation = {
@@ -193,8 +495,7 @@ def main():
         evaluation["viz"] = viz
 
     results_path = out_dir / "results.json"
-    with results_path.open("w", encoding="utf-8") as fp:
-        json.dump(evaluation, fp, indent=2)
+    write_json(evaluation, results_path)
     print(f"Wrote {results_path}")
 
 if __name__ == "__main__":
@@ -1,10 +1,17 @@
 from __future__ import annotations
-import sys, subprocess
+import sys
 from pathlib import Path
 import argparse
 
 def main() -> None:
     root = Path(__file__).resolve().parents[1]
+    # checks/ and summaries/ live next to the package in the source tree; run them in-process
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from checks.run_checks import CHUNK_ROWS
+    from checks.run_checks import main as run_checks_main
+    from summaries.write_summary import main as write_summary_main
+
     parser = argparse.ArgumentParser(description="Data Quality Sentry CLI")
     sub = parser.add_subparsers(dest="cmd")
 
@@ -20,25 +27,27 @@ def main() -> None:
     p_run.add_argument("--fix-dry-run", action="store_true")
     p_run.add_argument("--max-impact-pct", type=float, default=2.0)
     p_run.add_argument("--max-cell-changes-pct", type=float, default=5.0)
+    p_run.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    p_run.add_argument("--engine", choices=["auto","pandas","pyarrow"], default="pandas")
+    p_run.add_argument("--jobs", type=int, default=1)
 
     args = parser.parse_args()
     if args.cmd is None:
         args = parser.parse_args(["run"])
 
     out_dir = Path(args.out); out_dir.mkdir(parents=True, exist_ok=True)
-    cmd1 = [sys.executable, str(root/"checks"/"run_checks.py"),
-            "--rules", args.rules, "--out", str(out_dir),
+    argv1 = ["--rules", args.rules, "--out", str(out_dir),
             "--delimiter", args.delimiter, "--encoding", args.encoding, "--redact", args.redact, "--viz", args.viz,
-            "--max-impact-pct", str(args.max_impact_pct), "--max-cell-changes-pct", str(args.max_cell_changes_pct)]
+            "--max-impact-pct", str(args.max_impact_pct), "--max-cell-changes-pct", str(args.max_cell_changes_pct),
+            "--chunksize", str(args.chunksize), "--engine", args.engine, "--jobs", str(args.jobs)]
     if args.source:
-        cmd1 += ["--source_override", args.source]
+        argv1 += ["--source_override", args.source]
     if args.fix:
-        cmd1 += ["--fix"]
+        argv1 += ["--fix"]
     if args.fix_dry_run:
-        cmd1 += ["--fix-dry-run"]
-    subprocess.run(cmd1, check=True)
+        argv1 += ["--fix-dry-run"]
+    run_checks_main(argv1)
 
-    cmd2 = [sys.executable, str(root/"summaries"/"write_summary.py"),
-            "--results", str(out_dir/"results.json"), "--out", str(out_dir/"index.html"), "--viz", args.viz]
-    subprocess.run(cmd2, check=True)
+    argv2 = ["--results", str(out_dir/"results.json"), "--out", str(out_dir/"index.html"), "--viz", args.viz]
+    write_summary_main(argv2)
     print(f"Done. Open {out_dir/'index.html'}")
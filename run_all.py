@@ -24,10 +24,13 @@ import argparse
 import datetime
 import json
 import shutil
-import subprocess
-import sys
 from pathlib import Path
 
+from checks.fixers import write_json
+from checks.run_checks import CHUNK_ROWS
+from checks.run_checks import main as run_checks_main
+from summaries.write_summary import main as write_summary_main
+
 
 def _safe_stem(path: str | None) -> str:
     """Return a safe filesystem stem based on the dataset filename."""
@@ -76,6 +79,24 @@ def main() -> None:
         default=5.0,
         help="Abort if cell modifications exceed this percent",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=CHUNK_ROWS,
+        help="Rows read per chunk while evaluating checks",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "pandas", "pyarrow"],
+        default="pandas",
+        help="CSV parser (auto uses pyarrow when installed; pyarrow reads the whole file at once)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Threads used to evaluate the checks of each chunk",
+    )
     parser.add_argument(
         "--title",
         type=str,
@@ -99,10 +120,8 @@ def main() -> None:
     mode = "fix" if args.fix else "plain"
     stamp = _timestamp()
 
-    # Run the check runner
-    runner_cmd = [
-        sys.executable,
-        str(root / "checks" / "run_checks.py"),
+    # Run the check runner in-process
+    runner_args = [
         "--rules",
         args.rules,
         "--out",
@@ -119,15 +138,21 @@ def main() -> None:
         str(args.max_impact_pct),
         "--max-cell-changes-pct",
         str(args.max_cell_changes_pct),
+        "--chunksize",
+        str(args.chunksize),
+        "--engine",
+        args.engine,
+        "--jobs",
+        str(args.jobs),
     ]
     if args.source:
-        runner_cmd += ["--source_override", args.source]
+        runner_args += ["--source_override", args.source]
     if args.fix:
-        runner_cmd.append("--fix")
+        runner_args.append("--fix")
     if args.fix_dry_run:
-        runner_cmd.append("--fix-dry-run")
+        runner_args.append("--fix-dry-run")
 
-    subprocess.run(runner_cmd, check=True)
+    run_checks_main(runner_args)
 
     # Insert minimal summary into results.json and copy to descriptive filename
     canonical_results = out_dir / "results.json"
@@ -152,16 +177,14 @@ def main() -> None:
                     "failed": failed,
                     "top_failing": top_failing,
                 }
-                canonical_results.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                write_json(data, canonical_results)
         except Exception:
             pass
         shutil.copy2(canonical_results, descriptive_results)
 
     # Build HTML report with descriptive name
     descriptive_html = out_dir / f"{dataset_stem}__{stamp}__{mode}.html"
-    writer_cmd = [
-        sys.executable,
-        str(root / "summaries" / "write_summary.py"),
+    writer_args = [
         "--results",
         str(descriptive_results if descriptive_results.exists() else canonical_results),
         "--out",
@@ -170,10 +193,10 @@ def main() -> None:
         args.viz,
     ]
     if args.title:
-        writer_cmd += ["--title", args.title]
+        writer_args += ["--title", args.title]
     if args.label:
-        writer_cmd += ["--label", args.label]
-    subprocess.run(writer_cmd, check=True)
+        writer_args += ["--label", args.label]
+    write_summary_main(writer_args)
 
     # Write or update a small index.html linking to the latest report
     index_path = out_dir / "index.html"
@@ -261,12 +261,12 @@ TEMPLATE_STR = r"""<!DOCTYPE html>
 </body>
 </html>"""
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--results", type=str, required=True)
     parser.add_argument("--out", type=str, required=True)
     parser.add_argument("--viz", choices=["on","off"], default="on")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     results_path = Path(args.results)
     results = json.loads(results_path.read_text(encoding="utf-8"))
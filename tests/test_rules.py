@@ -2,11 +2,13 @@
 
 These tests exercise the high‑level `run_all.py` entry point by creating
 temporary CSV datasets and corresponding rules files, running the checks
-via a subprocess and asserting that the expected failures are reported
-in the resulting JSON output.
+in-process (or via a subprocess when ``DQS_TEST_SUBPROCESS`` is set) and
+asserting that the expected failures are reported in the resulting JSON
+output.
 
 The goal of these tests is to provide confidence that duplicate,
-enumeration, range and null rate checks behave as expected.
+enumeration, range, null rate and freshness checks behave as expected,
+and that the fixers, kernels and run options agree with them.
 """
 
 from __future__ import annotations
@@ -18,8 +20,18 @@ import sys
 import tempfile
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
 
-def _run_and_load(data_csv: str, rules_yaml: str) -> dict:
+from checks import fixers, kernels, run_checks
+from checks.fixers import FixContext, FixReport, apply_fixes, clip_range
+from checks.run_checks import _fix_plan
+
+
+def _run_and_load(
+    data_csv: str, rules_yaml: str, monkeypatch: pytest.MonkeyPatch, extra_args: list[str] | None = None
+) -> dict:
     """Run the pipeline on the given data and rules, return parsed results.json."""
     with tempfile.TemporaryDirectory() as tmpdir:
         # Write data and rules to temporary files
@@ -31,9 +43,7 @@ def _run_and_load(data_csv: str, rules_yaml: str) -> dict:
         rules_path.write_text(rules_yaml, encoding="utf-8")
 
         repo_root = Path(__file__).resolve().parents[1]
-        cmd = [
-            sys.executable,
-            str(repo_root / "run_all.py"),
+        args = [
             "--source",
             str(data_path),
             "--rules",
@@ -43,15 +53,24 @@ def _run_and_load(data_csv: str, rules_yaml: str) -> dict:
             "--viz",
             "off",
         ]
-        # Run without fixes; use check=True to raise on failure
-        subprocess.run(cmd, check=True)
+        args += extra_args or []
+        if os.getenv("DQS_TEST_SUBPROCESS"):
+            # Fresh interpreter per run; use check=True to raise on failure
+            subprocess.run([sys.executable, str(repo_root / "run_all.py"), *args], check=True)
+        else:
+            # Same process: pandas and friends are imported once for the whole session
+            monkeypatch.syspath_prepend(str(repo_root))
+            monkeypatch.setattr(sys, "argv", ["run_all.py", *args])
+            from run_all import main
+
+            main()
         # After the run the canonical results.json exists
         res_file = out_path / "results.json"
         assert res_file.exists(), f"results.json was not created at {res_file}"
         return json.loads(res_file.read_text(encoding="utf-8"))
 
 
-def test_duplicate_detection() -> None:
+def test_duplicate_detection(monkeypatch: pytest.MonkeyPatch) -> None:
     """Duplicate check should flag repeated IDs."""
     data = """id,amount\n1,10\n1,15\n2,20\n3,25\n"""
     rules = """
@@ -62,7 +81,7 @@ tables:
         subset: [id]
     columns: []
 """
-    res = _run_and_load(data, rules)
+    res = _run_and_load(data, rules, monkeypatch)
     # Expect exactly one duplicate failure
     dup_checks = [c for c in res["checks"] if c["type"] == "duplicate"]
     assert len(dup_checks) == 1
@@ -70,7 +89,86 @@ tables:
     assert dup_checks[0]["count"] == 1
 
 
-def test_enum_validation() -> None:
+def test_duplicate_detection_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Duplicates split over separate read chunks should still be flagged."""
+    data = """id,amount\n1,10\n2,15\n3,20\n1,25\n2,30\n"""
+    rules = """
+tables:
+  - name: test
+    checks:
+      - type: duplicate
+        subset: [id]
+    columns: []
+"""
+    res = _run_and_load(data, rules, monkeypatch, ["--chunksize", "2"])
+    dup_checks = [c for c in res["checks"] if c["type"] == "duplicate"]
+    assert dup_checks[0]["status"] == "fail"
+    assert dup_checks[0]["count"] == 2
+
+
+def test_duplicate_detection_keeps_large_integer_keys_apart(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """IDs above 2**53 that differ only in the last digit are not duplicates, in any chunking."""
+    ids = [100000000000000000 + i for i in range(6)] + [100000000000000003]
+    data = "id,amount\n" + "".join(f"{i},{n}\n" for n, i in enumerate(ids))
+    rules = """
+tables:
+  - name: test
+    checks:
+      - type: duplicate
+        subset: [id]
+    columns: []
+"""
+    for extra in ([], ["--chunksize", "2"]):
+        res = _run_and_load(data, rules, monkeypatch, extra)
+        assert [c["count"] for c in res["checks"] if c["type"] == "duplicate"] == [1]
+
+    report = FixReport()
+    out = apply_fixes(pd.DataFrame({"id": ids}), [], report, "test", tmp_path, duplicate_subsets=[["id"]])
+    assert out["id"].tolist() == ids[:6]
+
+
+def test_duplicate_hash_collisions_are_not_flagged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A key whose hash matches an earlier, different key is only flagged when the values match too."""
+    monkeypatch.setattr(run_checks, "row_hashes", lambda keys, as_float=(): np.zeros(len(keys), dtype=np.uint64))
+    seen = run_checks._SeenKeys()
+    assert seen.flag(pd.DataFrame({"id": [1, 2, 2]})).tolist() == [False, False, True]
+    assert seen.flag(pd.DataFrame({"id": [3, 1]})).tolist() == [False, True]
+
+
+def test_duplicate_key_read_as_int_then_float() -> None:
+    """A key column typed int in one chunk and float in the next still matches across chunks."""
+    seen = run_checks._SeenKeys()
+    assert not seen.flag(pd.DataFrame({"id": [1, 2]})).any()
+    assert seen.flag(pd.DataFrame({"id": [2.0, np.nan, 3.0]})).tolist() == [True, False, False]
+    assert seen.flag(pd.DataFrame({"id": [np.nan, 1.0]})).tolist() == [True, True]
+
+
+def test_duplicate_key_widened_to_float_after_large_ints(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Large int keys that collapse to one float64 when the column widens don't break later lookups."""
+    data = "id\n1500000000000000001\n1500000000000000002\n\n7\n"
+    rules = """
+tables:
+  - name: test
+    checks:
+      - type: duplicate
+        subset: [id]
+    columns: []
+"""
+    res = _run_and_load(data, rules, monkeypatch, ["--chunksize", "2"])
+    assert [c["count"] for c in res["checks"] if c["type"] == "duplicate"] == [0]
+    res = _run_and_load(data + "1500000000000000002\n", rules, monkeypatch, ["--chunksize", "2"])
+    assert [c["count"] for c in res["checks"] if c["type"] == "duplicate"] == [1]
+
+
+def test_duplicate_keys_stay_found_as_the_table_grows() -> None:
+    """Keys stored before the hash table doubles are still found after it, in every later chunk."""
+    seen = run_checks._SeenKeys()
+    for start in range(0, 6000, 1500):
+        assert not seen.flag(pd.DataFrame({"id": np.arange(start, start + 1500)})).any()
+    assert seen.flag(pd.DataFrame({"id": [0, 5999, 6000, 2999]})).tolist() == [True, True, False, True]
+
+
+def test_enum_validation(monkeypatch: pytest.MonkeyPatch) -> None:
     """Enum check should flag unexpected values."""
     data = """id,status\n1,new\n2,processing\n3,invalid\n4,shipped\n"""
     rules = """
@@ -83,14 +181,14 @@ tables:
           - type: enum
             allowed: [new, processing, shipped]
 """
-    res = _run_and_load(data, rules)
+    res = _run_and_load(data, rules, monkeypatch)
     enum_fail = [c for c in res["checks"] if c["type"] == "enum"]
     assert enum_fail, "No enum check found"
     assert enum_fail[0]["status"] == "fail"
     assert enum_fail[0]["count"] == 1
 
 
-def test_range_validation() -> None:
+def test_range_validation(monkeypatch: pytest.MonkeyPatch) -> None:
     """Range check should flag numbers outside of bounds."""
     data = """id,amount\n1,5\n2,15\n3,25\n4,-3\n"""
     rules = """
@@ -104,7 +202,7 @@ tables:
             min: 0
             max: 20
 """
-    res = _run_and_load(data, rules)
+    res = _run_and_load(data, rules, monkeypatch)
     range_chk = [c for c in res["checks"] if c["type"] == "range"]
     assert range_chk, "No range check found"
     # two values out of range: 25 and -3
@@ -112,7 +210,7 @@ tables:
     assert range_chk[0]["count"] == 2
 
 
-def test_null_rate() -> None:
+def test_null_rate(monkeypatch: pytest.MonkeyPatch) -> None:
     """Null rate check should flag excessive missing values."""
     data = """id,notes\n1,a\n2,\n3,b\n4,\n"""
     rules = """
@@ -125,9 +223,411 @@ tables:
           - type: null_rate
             max_nulls: 0
 """
-    res = _run_and_load(data, rules)
+    res = _run_and_load(data, rules, monkeypatch)
     nr_chk = [c for c in res["checks"] if c["type"] == "null_rate"]
     assert nr_chk, "No null_rate check found"
     assert nr_chk[0]["status"] == "fail"
     # two null values present
-    assert nr_chk[0]["count"] == 2
\ No newline at end of file
+    assert nr_chk[0]["count"] == 2
+
+
+def test_repeated_check_names_keep_separate_samples(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Two checks of one type on a column must not share (or delete) each other's sample file."""
+    data = """id,notes\n1,a\n2,\n3,b\n"""
+    rules = """
+tables:
+  - name: test
+    checks: []
+    columns:
+      - name: notes
+        checks:
+          - type: null_rate
+            max_nulls: 5
+          - type: null_rate
+            max_nulls: 0
+          - type: null_rate
+            max_null_frac: 0.9
+"""
+    res = _run_and_load(data, rules, monkeypatch)
+    statuses = [c["status"] for c in res["checks"] if c["type"] == "null_rate"]
+    assert statuses == ["pass", "fail", "pass"]
+    assert res["failure_samples"] == {"test.notes.null_rate": "test_notes_null_rate_2.csv"}
+
+
+def test_freshness_format_inferred_once_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without parse_format the format comes from the file's first date, not each chunk's."""
+    data = """id,updated\n1,2024-01-01\n2,01/02/2024\n3,01/03/2024\n4,2024-01-04\n"""
+    rules = """
+tables:
+  - name: test
+    checks: []
+    columns:
+      - name: updated
+        checks:
+          - type: freshness
+            max_age_days: 100000
+"""
+    for chunksize in ("1", "3", "1000"):
+        res = _run_and_load(data, rules, monkeypatch, ["--chunksize", chunksize])
+        fresh = [c for c in res["checks"] if c["type"] == "freshness"]
+        # the two US-style dates do not match the inferred %Y-%m-%d
+        assert fresh[0]["count"] == 2
+
+
+def test_checks_sharing_a_column_see_the_same_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Range skips non-numeric and missing values, null_rate counts the missing, enum flags them."""
+    data = """id,amount,status\n1,5,new\n2,abc,new\n3,,\n4,50,old\n"""
+    rules = """
+tables:
+  - name: test
+    checks: []
+    columns:
+      - name: amount
+        checks:
+          - type: range
+            min: 0
+            max: 20
+          - type: null_rate
+            max_nulls: 0
+      - name: status
+        checks:
+          - type: enum
+            allowed: [new]
+"""
+    res = _run_and_load(data, rules, monkeypatch)
+    assert [(c["type"], c["count"]) for c in res["checks"]] == [("range", 1), ("null_rate", 1), ("enum", 2)]
+
+
+def test_fix_actions_run_in_rule_order(tmp_path: Path) -> None:
+    """Each fix action sees the column as left by the action written before it."""
+    df = pd.DataFrame({"code": [1, 5, 3, 2]})
+    report = FixReport()
+    plan = [("code", [("enum", [1, 2, 3]), ("clip", (0, 2))])]
+    out = apply_fixes(df, plan, report, "t", tmp_path)
+    affected = {a["action"]: a["affected"] for a in report.actions}
+    # enum runs on the raw values (only 5 is invalid), clipping afterwards touches 5 and 3
+    assert affected == {"quarantine_invalid_enum": 1, "clip": 2}
+    assert out["code"].tolist() == [1, 2, 2, 2]
+
+
+def test_repeated_checks_on_a_column_all_fix(tmp_path: Path) -> None:
+    """A second range check on the same column adds a step instead of replacing the first."""
+    table = {
+        "name": "t",
+        "columns": [{"name": "x", "checks": [{"type": "range", "min": 0}, {"type": "range", "max": 10}]}],
+    }
+    plan, subsets = _fix_plan(table)
+    assert plan == [("x", [("clip", (0, None)), ("clip", (None, 10))])]
+    assert subsets == []
+    report = FixReport()
+    out = apply_fixes(pd.DataFrame({"x": [-5, 5, 20]}), plan, report, "t", tmp_path)
+    assert [a["affected"] for a in report.actions] == [1, 1]
+    assert out["x"].tolist() == [0, 5, 10]
+
+
+def test_clip_range_quarantines_changed_values(tmp_path: Path) -> None:
+    """clip_range keeps NaN, reports only changed cells and quarantines their old and new values."""
+    report = FixReport()
+    out = clip_range(pd.DataFrame({"x": [1.0, None, 50.0]}), "x", 0, 10, report, "t", tmp_path)
+    assert out["x"].tolist()[::2] == [1.0, 10.0] and pd.isna(out["x"][1])
+    assert report.actions[0]["affected"] == 1
+    quarantined = pd.read_csv(tmp_path / "t_x_range_clipped.csv")
+    assert quarantined.to_dict("list") == {"x": [50.0], "x_clipped": [10.0]}
+
+
+def test_drop_exact_duplicates_quarantines_later_copies(tmp_path: Path) -> None:
+    """The first copy of each key is kept in order, with its index; later copies go to quarantine."""
+    df = pd.DataFrame({"id": [1, 2, 1, 3, 2, 1], "v": list("abcdef")}, index=[10, 11, 12, 13, 14, 15])
+    report = FixReport()
+    out = fixers.drop_exact_duplicates(df, ["id"], report, "t", tmp_path)
+    assert out.index.tolist() == [10, 11, 13] and out["v"].tolist() == ["a", "b", "d"]
+    assert report.actions[0]["affected"] == 3
+    assert pd.read_csv(tmp_path / "t_duplicate_rows.csv").to_dict("list") == {"id": [1, 2, 1], "v": ["c", "e", "f"]}
+
+
+def test_categorical_columns_check_like_object_columns() -> None:
+    """Range and enum masks are the same whether a column was stored as category or left as object."""
+    raw = pd.DataFrame({"x": ["1", "5", None, "x", "5", "1"] * 10})
+    cat = run_checks._categorize(raw, ["x"])
+    assert isinstance(cat["x"].dtype, pd.CategoricalDtype)
+    num_o, na_o, values_o = run_checks._typed_column(raw["x"], True)
+    num_c, na_c, values_c = run_checks._typed_column(cat["x"], True)
+    np.testing.assert_array_equal(num_c, num_o)
+    np.testing.assert_array_equal(na_c, na_o)
+    np.testing.assert_array_equal(run_checks._mask_range(num_c, 0, 3), run_checks._mask_range(num_o, 0, 3))
+    np.testing.assert_array_equal(run_checks._mask_enum(values_c, ["1", "y"]), run_checks._mask_enum(values_o, ["1", "y"]))
+
+
+def test_only_enum_and_duplicate_columns_are_categorized() -> None:
+    """Columns that no enum or duplicate check compares stay object-typed."""
+    columns = ["id", "status", "note"]
+    for subset, expected in ((["id", "gone"], ["id", "status"]), (None, columns)):
+        rules = {"tables": [{"name": "t", "checks": [{"type": "duplicate", "subset": subset}],
+                             "columns": [{"name": "status", "checks": [{"type": "enum", "allowed": ["a"]}]},
+                                         {"name": "note", "checks": [{"type": "null_rate", "max_nulls": 0}]}]}]}
+        assert run_checks._category_columns(run_checks._compile_checks(rules), columns) == expected
+    chunk = pd.DataFrame({"id": ["a", "b"] * 5, "status": ["a"] * 10, "note": ["n"] * 10})
+    out = run_checks._categorize(chunk, ["id", "status"])
+    assert [str(t) for t in out.dtypes] == ["category", "category", "object"]
+
+
+def test_engines_agree_on_missing_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The Arrow reader treats pandas' default NA strings (None, <NA>, NULL, ...) as missing too."""
+    pytest.importorskip("pyarrow")
+    data = """id,notes\n1,None\n2,<NA>\n3,x\n4,\n5,NULL\n6,n/a\n"""
+    rules = """
+tables:
+  - name: test
+    checks: []
+    columns:
+      - name: notes
+        checks:
+          - type: null_rate
+            max_nulls: 0
+"""
+    counts = []
+    for engine in ("pandas", "pyarrow"):
+        res = _run_and_load(data, rules, monkeypatch, ["--engine", engine])
+        counts += [c["count"] for c in res["checks"] if c["type"] == "null_rate"]
+    assert counts == [5, 5]
+
+
+def test_clip_and_range_kernels() -> None:
+    """Clipping counts only the values it moved; NaN passes through and is never flagged."""
+    a = np.array([-1.0, 0.5, np.nan, 3.0, 10.0, -0.0])
+    clipped, changed, count = kernels.clip_and_count(a, 0, 3)
+    np.testing.assert_array_equal(clipped, [0.0, 0.5, np.nan, 3.0, 3.0, -0.0])
+    assert changed.tolist() == [True, False, False, False, True, False] and count == 2
+    assert kernels.range_mask(a, 0, 3).tolist() == changed.tolist()
+    assert kernels.range_mask(a, None, 3).tolist() == [False, False, False, False, True, False]
+    ints = np.array([5, -2, 7])
+    assert kernels.clip_and_count(ints, None, 6)[0].tolist() == [5, -2, 6]
+
+
+def test_freshness_kernel() -> None:
+    """Unparsed values are flagged unless missing; parsed values are flagged from ``min_age`` ns old."""
+    parsed = np.array([kernels.NAT_NS, kernels.NAT_NS, 0, 5 * 10**9, 9 * 10**9], dtype=np.int64)
+    notna = np.array([True, False, True, True, True])
+    now = 10 * 10**9
+    assert kernels.freshness_mask(parsed, notna, now, 5 * 10**9).tolist() == [True, False, True, True, False]
+    assert kernels.freshness_mask(parsed, notna, now, None).tolist() == [True, False, False, False, False]
+    assert kernels.freshness_mask(parsed, notna, now, -10**9).tolist() == [True, False, True, True, True]
+    # cutoffs beyond the int64 range: nothing parsed is that old, or everything is
+    assert kernels.freshness_mask(parsed, notna, now, 2**64).tolist() == [True, False, False, False, False]
+    assert kernels.freshness_mask(parsed, notna, now, -(2**64)).tolist() == [True, False, True, True, True]
+
+
+def test_jobs_and_engine_options_give_the_same_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Checking with a thread pool or the Arrow reader reports the same counts as the default run."""
+    data = "id,amount,status\n" + "".join(f"{i % 7},{i % 30},{'ok' if i % 3 else 'bad'}\n" for i in range(50))
+    rules = """
+tables:
+  - name: test
+    checks:
+      - type: duplicate
+        subset: [id]
+    columns:
+      - name: amount
+        checks:
+          - type: range
+            min: 0
+            max: 20
+      - name: status
+        checks:
+          - type: enum
+            allowed: [ok]
+"""
+    runs = [[], ["--jobs", "3", "--chunksize", "8"]]
+    try:
+        import pyarrow  # noqa: F401
+        runs.append(["--engine", "pyarrow"])
+    except ImportError:
+        pass
+    counts = [[c["count"] for c in _run_and_load(data, rules, monkeypatch, extra)["checks"]] for extra in runs]
+    assert counts[0] == [43, 9, 17]
+    assert all(c == counts[0] for c in counts)
+
+
+def test_fix_report_emits_one_dict_per_action() -> None:
+    """Actions come back as dicts in the order they were added."""
+    report = FixReport()
+    report.total_rows_before = 3
+    report.add(rule="t_trim", table="t", column=None, action="trim_strings", affected=2)
+    report.add(rule="t_x_range", table="t", column="x", action="clip", affected=1, notes="min=0, max=1")
+    assert report.to_dict() == {
+        "total_rows_before": 3,
+        "total_rows_after": None,
+        "actions": [
+            {"rule": "t_trim", "table": "t", "column": None, "action": "trim_strings", "affected": 2, "notes": ""},
+            {"rule": "t_x_range", "table": "t", "column": "x", "action": "clip", "affected": 1, "notes": "min=0, max=1"},
+        ],
+    }
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_strip_counts_trimmed_values(monkeypatch: pytest.MonkeyPatch, arrow: bool) -> None:
+    """Trimming gives the same strings and count with and without pyarrow, missing values included."""
+    if arrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(fixers, "pa", None)
+    trimmed, changed = fixers._strip(np.array([" a", "b", None, np.nan, "c \t", "é "], dtype=object))
+    assert list(trimmed) == ["a", "b", "None", "nan", "c", "é"]
+    assert changed == 3
+
+
+def test_compiled_checks_bind_their_rule_parameters() -> None:
+    """Each check gets a mask function bound to its own parameters; unknown types get none and pass."""
+    rules = run_checks._parse_rules("""
+tables:
+  - name: t
+    columns:
+      - name: x
+        checks:
+          - type: range
+            max: 1
+          - type: range
+            min: 5
+          - type: mystery
+""")
+    specs = run_checks._compile_checks(rules)
+    assert [s["mask_fn"] is None for s in specs] == [False, False, True]
+    chunk = pd.DataFrame({"x": [0, 3, 9]})
+    typed = run_checks._typed_columns(chunk, specs[:2])
+    assert [run_checks._run_check(chunk, typed, s).tolist() for s in specs[:2]] == [[False, True, True], [True, True, False]]
+    assert run_checks._status(specs[2], 3) == "pass"
+
+
+def test_freshness_matches_whole_day_age() -> None:
+    """The nanosecond threshold flags exactly what ``(now - parsed).dt.days > max_age_days`` flags."""
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    offsets = [-1, 0.5, 0.99, 1.01, 1.5, 1.99, 2.01, 3.5]
+    values = [(now - pd.Timedelta(days=d)).strftime("%Y-%m-%d %H:%M:%S") for d in offsets] + ["junk", None]
+    series = pd.Series(values, dtype=object)
+    parsed = pd.to_datetime(series, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    for max_age in (-0.5, 0, 1, 1.5, 2, 10**6, -(10**6)):
+        expected = ((parsed.isna() & series.notna()) | ((now - parsed).dt.days > max_age)).tolist()
+        assert run_checks._mask_freshness(series, max_age, "%Y-%m-%d %H:%M:%S").tolist() == expected
+    assert run_checks._mask_freshness(series).tolist() == [False] * len(offsets) + [True, False]
+
+
+def test_fix_context_reuses_check_results_until_a_column_changes(tmp_path: Path) -> None:
+    """Cached dates and duplicate masks are used while their columns are untouched, and dropped after."""
+    df = pd.DataFrame({"id": ["a", "b", "c"], "d": ["2024-01-01", "x", None]})
+    ctx = FixContext()
+    cached = pd.Series(pd.to_datetime(["2020-02-02", None, None]), index=df.index)
+    ctx.parsed_cache[("d", None)] = cached
+    ctx.dup_masks[("id",)] = np.array([False, False, True])
+    out = apply_fixes(df.copy(), [("d", [("date_fmt", None)])], FixReport(), "t", tmp_path,
+                      duplicate_subsets=[["id"]], ctx=ctx)
+    assert out["id"].tolist() == ["a", "b"]  # the cached mask was used, not a recomputed one
+    assert out["d"].iloc[0] == pd.Timestamp("2020-02-02")
+    assert ctx.parsed_cache == {} and ctx.dup_masks == {}
+
+    ctx.parsed_cache[("d", None)] = cached
+    ctx.dup_masks[("id",)] = np.array([False, False, True])
+    out = apply_fixes(df.assign(id=["a ", "b", "c"]), [("d", [("fill", "2024-03-03"), ("date_fmt", None)])], FixReport(),
+                      "t", tmp_path, trim_columns=["id"], duplicate_subsets=[["id"]], ctx=ctx)
+    assert out["id"].tolist() == ["a", "b", "c"]  # trimming "id" invalidated the mask
+    assert out["d"].tolist()[0::2] == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-03")]
+
+    ctx.parsed_cache[("d", None)] = cached
+    df["d"] = [" 2024-01-01", "x", None]
+    out = apply_fixes(df, [("d", [("date_fmt", None)])], FixReport(), "t", tmp_path, trim_columns=["d"], ctx=ctx)
+    assert out["d"].iloc[0] == pd.Timestamp("2024-01-01")  # trimming "d" invalidated the cache
+    assert ctx.parsed_cache == {}
+
+
+def test_freshness_checks_share_explicit_formats_only() -> None:
+    """Only freshness checks with a parse_format feed the fix pass, one sink per (column, format)."""
+    rules = run_checks._parse_rules("""
+tables:
+  - name: t
+    columns:
+      - name: d
+        checks:
+          - type: freshness
+            parse_format: "%Y-%m-%d"
+          - type: freshness
+            parse_format: "%Y-%m-%d"
+            max_age_days: 1
+          - type: freshness
+""")
+    sinks: dict = {}
+    specs = run_checks._compile_checks(rules, sinks)
+    chunk = pd.DataFrame({"d": ["2024-01-01", "bad"]})
+    for spec in specs:
+        run_checks._run_check(chunk, {}, spec)
+    assert list(sinks) == [("d", "%Y-%m-%d")]
+    assert len(sinks[("d", "%Y-%m-%d")]) == 1 and sinks[("d", "%Y-%m-%d")][0].isna().tolist() == [False, True]
+
+
+def test_checks_that_cannot_fail_collect_no_samples() -> None:
+    """Freshness without max_age_days and null_rate without limits get no failure-sample slots."""
+    rules = {"tables": [{"name": "t", "columns": [{"name": "x", "checks": [
+        {"type": "null_rate"}, {"type": "null_rate", "max_null_frac": 0.5},
+        {"type": "freshness"}, {"type": "freshness", "max_age_days": 3},
+    ]}]}]}
+    specs = run_checks._compile_checks(rules)
+    assert [s["remaining"] for s in specs] == [0, run_checks.SAMPLE_ROWS, 0, run_checks.SAMPLE_ROWS]
+
+
+def test_write_csv_engines_write_the_same_rows(tmp_path: Path) -> None:
+    """Both writers round-trip the same rows to paths and file objects; frames Arrow cannot type fall back to pandas."""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"id": [1, 2], "name": ["a b", "c"], "score": [1.5, np.nan]})
+    for engine in ("pandas", "pyarrow"):
+        fixers.write_csv(df, tmp_path / f"{engine}.csv", engine=engine)
+        with (tmp_path / f"{engine}_rows.csv").open("wb") as fp:
+            fixers.write_csv(df.head(1), fp, engine=engine)
+            fixers.write_csv(df.tail(1), fp, header=False, engine=engine)
+        for name in (f"{engine}.csv", f"{engine}_rows.csv"):
+            pd.testing.assert_frame_equal(pd.read_csv(tmp_path / name), df)
+    mixed = pd.DataFrame({"d": ["x", pd.Timestamp("2024-01-02")]}, dtype=object)
+    fixers.write_csv(mixed, tmp_path / "mixed.csv", engine="pyarrow")
+    assert (tmp_path / "mixed.csv").read_text(encoding="utf-8") == mixed.to_csv(index=False)
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_write_json_round_trips(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, fast: bool) -> None:
+    """Reports read back the same with orjson and with the json fallback, non-ASCII text included."""
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fixers, "orjson", None)
+    obj = {"name": "café", "count": 3, "frac": 0.25, "checks": [{"status": "pass", "column": None}]}
+    fixers.write_json(obj, tmp_path / "out.json")
+    text = (tmp_path / "out.json").read_text(encoding="utf-8")
+    assert json.loads(text) == obj and text.startswith('{\n  "name"')
+
+
+def test_cli_runs_checks_and_summary_in_process(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """`dqs run` calls the runner and the summary writer directly instead of spawning interpreters."""
+    from dqs import cli
+
+    def _no_subprocess(*args: object, **kwargs: object) -> None:
+        raise AssertionError("dqs run spawned a subprocess")
+
+    monkeypatch.setattr(subprocess, "run", _no_subprocess)
+    (tmp_path / "data.csv").write_text("id,status\n1,paid\n2,lost\n", encoding="utf-8")
+    (tmp_path / "rules.yml").write_text(
+        "tables:\n  - name: t\n    columns:\n      - name: status\n        checks:\n"
+        "          - type: enum\n            allowed: [paid]\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["dqs", "run", "--source", str(tmp_path / "data.csv"),
+                                      "--rules", str(tmp_path / "rules.yml"), "--out", str(tmp_path / "out")])
+    cli.main()
+    results = json.loads((tmp_path / "out" / "results.json").read_text(encoding="utf-8"))
+    assert [(c["name"], c["count"]) for c in results["checks"]] == [("t.status.enum", 1)]
+    assert (tmp_path / "out" / "index.html").exists()
+
+
+def test_null_heatmap_marks_missing_cells(tmp_path: Path) -> None:
+    """The heatmap grid has one 0/1 row per leading data row, for the failing null_rate columns."""
+    (tmp_path / "data.csv").write_text("a,b,c\n1,,x\n,2,\n3,4,z\n", encoding="utf-8")
+    (tmp_path / "rules.yml").write_text(
+        "tables:\n  - name: t\n    columns:\n      - name: b\n        checks:\n"
+        "          - type: null_rate\n            max_nulls: 0\n", encoding="utf-8")
+    run_checks.main(["--rules", str(tmp_path / "rules.yml"), "--out", str(tmp_path / "out"),
+                     "--source_override", str(tmp_path / "data.csv")])
+    results = json.loads((tmp_path / "out" / "results.json").read_text(encoding="utf-8"))
+    assert results["viz"]["null_heatmap"] == {"cols": ["b"], "grid": [[1], [0], [0]]}